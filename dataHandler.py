@@ -1,9 +1,30 @@
+import numpy as np
 import pandas as pd
 from indicators import Indicators
 import sqlite3
 from typing import Dict
 import sys
 
+# Rows fetched per round trip when streaming the full prices table
+READ_CHUNK_SIZE = 500_000
+
+# prices_data column -> DataFrame column expected by the strategies
+COLUMN_RENAME = {
+    "open": "Open",
+    "high": "High",
+    "low": "Low",
+    "close": "Close",
+    "adj_close": "Adj_close",
+    "volume": "Volume",
+    "rsi_10": "Rsi_10",
+    "sma_200": "Sma_200",
+}
+
+# Prices are loaded as float32 on purpose: it halves the frames and keeps ~7 significant
+# digits. That is lossless for the bundled sample DB (stored float32-rounded) but rounds
+# the full float64 values download_history.py writes from yfinance.
+PRICE_COLUMNS = ["Open", "High", "Low", "Close", "Adj_close"]
+
 class DataHandler:
     def __init__(self):
         self.data_dict = {}
@@ -15,25 +36,67 @@ class DataHandler:
         :return: A dictionary containing the processed DataFrame."""
 
         try:
-            conn = sqlite3.connect("sample_stocks.db")
+            conn = self._connect()
         except sqlite3.Error as e:
             print(f"Failed to connect to database: {e}")
             sys.exit(1)
         print("Connection to database established successfully. Loading data...")
 
-        df = pd.read_sql_query(
-            "SELECT * FROM prices_data", conn, parse_dates=["date"]
+        # Stream the table in chunks so the full result set is never held twice.
+        # Rows are ordered by ticker, so a ticker spans at most a couple of chunks.
+        parts: Dict[str, list] = {}
+        chunks = pd.read_sql_query(
+            "SELECT * FROM prices_data ORDER BY ticker, date", conn,
+            parse_dates=["date"], chunksize=READ_CHUNK_SIZE
         )
+        for chunk in chunks:
+            for t, frame in self._split_by_ticker(chunk).items():
+                parts.setdefault(t, []).append(frame)
         conn.close()
         print("Data loaded successfully from database.")
 
-        # Multi-index for fast grouping, then split to dict
-        df.set_index(["ticker", "date"], inplace=True)
-        df.columns = [str(c).capitalize() for c in df.columns]
-        self.data_dict = {t: g.copy() for t, g in df.groupby(level="ticker")} # .copy() → each DF owns its memory
-        del df
+        self.data_dict = {t: f[0] if len(f) == 1 else pd.concat(f) for t, f in parts.items()}
         return self.data_dict
 
+    @staticmethod
+    def _connect() -> sqlite3.Connection:
+        """
+        Opens the price database with a larger page cache and memory-mapped reads,
+        and makes sure the (ticker, date) index used by the per-ticker queries exists.
+        A read-only database without the index is still loaded, just without it.
+        """
+        conn = sqlite3.connect("sample_stocks.db")
+        conn.execute("PRAGMA cache_size = -200000")
+        conn.execute("PRAGMA mmap_size = 268435456")
+        try:
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_pd_ticker_date ON prices_data(ticker, date)")
+            conn.commit()
+        except sqlite3.OperationalError:
+            pass  # read-only file: ORDER BY falls back to a sort
+        return conn
+
+    @staticmethod
+    def _split_by_ticker(df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+        """
+        Splits the long prices table into per-ticker DataFrames indexed by date.
+        Rows are stably sorted by ticker once and sliced at the ticker boundaries,
+        which avoids the index hashing and per-group copies of groupby.
+
+        The returned frames are row views that share one backing buffer rather than
+        owning copies. Under pandas copy-on-write, writing to one ticker's frame
+        (e.g. adding indicator columns) copies only what is written and never
+        affects the other tickers.
+        """
+        df = df.sort_values("ticker", kind="mergesort")
+        tickers, starts = np.unique(df["ticker"].to_numpy(), return_index=True)
+        ends = np.append(starts[1:], len(df))
+
+        df = df.drop(columns="ticker").set_index("date")
+        df.rename(columns=COLUMN_RENAME, inplace=True)
+        df[PRICE_COLUMNS] = df[PRICE_COLUMNS].astype(np.float32)
+        df["Volume"] = pd.to_numeric(df["Volume"], downcast="integer")
+        return {t: df.iloc[s:e] for t, s, e in zip(tickers, starts, ends)}
+
 
     def get_data(self) -> pd.DataFrame:
         """
@@ -43,32 +106,6 @@ class DataHandler:
             raise ValueError("Data not prepared.")
         return self.dataFrame
     
-    ##############
-    def _parse_market_cap(self, value):
-        """
-        Converts string market cap (e.g., '1.5B', '200M') to float.
-        """
-        if pd.isna(value) or value == '':
-            return 0.0
-        
-        value = str(value).upper().strip()
-        multiplier = 1.0
-        
-        if 'T' in value:
-            multiplier = 1e12
-            value = value.replace('T', '')
-        elif 'B' in value:
-            multiplier = 1e9
-            value = value.replace('B', '')
-        elif 'M' in value:
-            multiplier = 1e6
-            value = value.replace('M', '')
-            
-        try:
-            return float(value) * multiplier
-        except ValueError:
-            return 0.0
-
     def load_filtered_data(self, min_market_cap: float = 10e9) -> Dict[str, pd.DataFrame]:
         """
         Loads price data only for stocks exceeding a specific Market Cap.
@@ -76,36 +113,38 @@ class DataHandler:
         info_table = "stock_metadata" # Change this if your metadata table has a different name
         
         try:
-            conn = sqlite3.connect("sample_stocks.db")
+            conn = self._connect()
             
-            # 1. Fetch metadata to identify relevant tickers
+            # 1. Parse Market Cap strings ('1.5B', '200M', ...) and filter tickers in SQL,
+            #    then load prices only for those tickers in the same query.
             # We use double quotes because "Market Cap" has a space
-            info_df = pd.read_sql_query(f'SELECT Ticker, "Market Cap" FROM {info_table}', conn)
-            
-            # 2. Convert Market Cap strings to numeric values
-            info_df['mcap_numeric'] = info_df['Market Cap'].apply(self._parse_market_cap)
-            
-            # 3. Filter tickers
-            valid_tickers = info_df[info_df['mcap_numeric'] >= min_market_cap]['Ticker'].tolist()
-            
-            if not valid_tickers:
-                print(f"[WARNING] No stocks found with Market Cap <= {min_market_cap}")
-                return {}
-
-            print(f"[INFO] Found {len(valid_tickers)} stocks matching criteria. Loading prices...")
+            query = f"""
+                WITH raw AS (
+                    SELECT Ticker, upper(trim("Market Cap")) AS cap FROM {info_table}
+                ),
+                mcap AS (
+                    SELECT Ticker,
+                           COALESCE(CASE substr(cap, -1)
+                               WHEN 'T' THEN CAST(substr(cap, 1, length(cap) - 1) AS REAL) * 1e12
+                               WHEN 'B' THEN CAST(substr(cap, 1, length(cap) - 1) AS REAL) * 1e9
+                               WHEN 'M' THEN CAST(substr(cap, 1, length(cap) - 1) AS REAL) * 1e6
+                               ELSE CAST(cap AS REAL)
+                           END, 0.0) AS mcap_numeric
+                    FROM raw
+                )
+                SELECT * FROM prices_data
+                WHERE ticker IN (SELECT Ticker FROM mcap WHERE mcap_numeric >= ?)
+            """
 
-            # 4. Load prices only for these tickers
-            # Using placeholders for SQL safety
-            placeholders = ','.join(['?'] * len(valid_tickers))
-            query = f"SELECT * FROM prices_data WHERE ticker IN ({placeholders})"
-            
-            df = pd.read_sql_query(query, conn, params=valid_tickers, parse_dates=["date"])
+            df = pd.read_sql_query(query, conn, params=(min_market_cap,), parse_dates=["date"])
             conn.close()
 
+            if df.empty:
+                print(f"[WARNING] No stocks found with Market Cap >= {min_market_cap}")
+                return {}
+
             # Process into dictionary
-            df.set_index(["ticker", "date"], inplace=True)
-            df.columns = [str(c).capitalize() for c in df.columns]
-            self.data_dict = {t: g.copy() for t, g in df.groupby(level="ticker")}
+            self.data_dict = self._split_by_ticker(df)
             
             print(f"[SUCCESS] Loaded {len(self.data_dict)} stocks for backtesting.")
             return self.data_dict
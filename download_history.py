@@ -10,7 +10,7 @@ import logging
 import sqlite3
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 import pandas as pd
 import yfinance as yf
@@ -26,10 +26,22 @@ logger = logging.getLogger(__name__)
 class StockDataFetcher:
     """Fetch and persist historical prices for a list of tickers."""
 
+    PRICE_COLUMNS = ["Symbol", "Date", "Open", "High", "Low", "Close", "AdjClose", "Volume"]
+
+    UPSERT_SQL = """
+        INSERT OR REPLACE INTO historical_stock_data
+        (symbol, date, open_price, high_price, low_price,
+         close_price, adj_close_price, volume)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
     def __init__(self, db_path: str = "stocks.db"):
         self.db_path = db_path
         Path(db_path).touch(exist_ok=True)
         self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
         self.create_historical_table()
 
     def create_historical_table(self) -> None:
@@ -94,66 +106,64 @@ class StockDataFetcher:
         end_date: datetime,
     ) -> Optional[pd.DataFrame]:
         """Return cleaned OHLCV DataFrame (or None if empty/error)."""
+        return self.fetch_stock_data_batch([symbol], start_date, end_date)
+
+    def fetch_stock_data_batch(
+        self,
+        symbols: List[str],
+        start_date: datetime,
+        end_date: datetime,
+    ) -> Optional[pd.DataFrame]:
+        """Return cleaned OHLCV rows for several symbols from one download call.
+
+        yfinance fetches the batch with its own thread pool and returns a wide
+        (symbol, field) frame, which is split back into long per-symbol rows.
+        """
         try:
             data = yf.download(
-                symbol,
+                symbols,
                 start=start_date,
                 end=end_date,
+                group_by="ticker",
+                auto_adjust=False,
                 progress=False,
-                threads=False,
+                threads=True,
             )
-            if data.empty:
+        except Exception as ex:
+            logger.error(f"fetch error for batch starting at {symbols[0]}: {ex}")
+            return None
+
+        if data is None or data.empty:
+            logger.warning(f"empty DataFrame for batch starting at {symbols[0]}")
+            return None
+
+        downloaded = set(data.columns.get_level_values(0))
+        frames = []
+        for symbol in symbols:
+            sub = data[symbol].dropna(how="all") if symbol in downloaded else None
+            if sub is None or sub.empty:
                 logger.warning(f"empty DataFrame for {symbol}")
-                return None
-
-            data.reset_index(inplace=True)
-            data["Symbol"] = symbol
-
-            data.columns = [
-                "Date",
-                "Open",
-                "High",
-                "Low",
-                "Close",
-                "AdjClose",
-                "Volume",
-                "Dividends",
-                "StockSplits",
-                "Symbol",
-            ]
-            data = data[
-                ["Symbol", "Date", "Open", "High", "Low", "Close", "AdjClose", "Volume"]
-            ]
-            return data
+                continue
 
-        except Exception as ex:
-            logger.error(f"fetch error for {symbol}: {ex}")
+            sub = sub.rename(columns={"Adj Close": "AdjClose"}).reset_index()
+            sub["Symbol"] = symbol
+            frames.append(sub[self.PRICE_COLUMNS])
+
+        if not frames:
             return None
+        return pd.concat(frames, ignore_index=True)
 
     def save_stock_data(self, df: pd.DataFrame) -> None:
-        """Upsert DataFrame rows into SQLite."""
-        cur = self.conn.cursor()
-        for _, row in df.iterrows():
-            cur.execute(
-                """
-                INSERT OR REPLACE INTO historical_stock_data
-                (symbol, date, open_price, high_price, low_price,
-                 close_price, adj_close_price, volume)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    row["Symbol"],
-                    row["Date"].strftime("%Y-%m-%d"),
-                    row["Open"],
-                    row["High"],
-                    row["Low"],
-                    row["Close"],
-                    row["AdjClose"],
-                    row["Volume"],
-                ),
-            )
-        self.conn.commit()
-        logger.info(f"saved {len(df)} rows for {df['Symbol'].iloc[0]}")
+        """Upsert DataFrame rows into SQLite in a single transaction."""
+        # Lazily zip the column Series (they yield Python scalars, which sqlite3 binds
+        # directly) so no projected copy or row list is ever materialized.
+        dates = df["Date"].dt.strftime("%Y-%m-%d")
+        rows = zip(df["Symbol"], dates, *(df[col] for col in self.PRICE_COLUMNS[2:]))
+        # The connection context commits on success and rolls back if the upsert raises,
+        # so a failed batch never leaves a transaction open for the next one
+        with self.conn:
+            self.conn.executemany(self.UPSERT_SQL, rows)
+        logger.info(f"saved {len(df)} rows for {df['Symbol'].nunique()} symbol(s)")
 
     def fetch_all(
         self,
@@ -162,33 +172,71 @@ class StockDataFetcher:
         table_name: str = "stock_metadata",
         symbol_column: str = "symbol",
         delay: float = 1.5,
+        batch_size: int = 100,
     ) -> None:
-        """Fetch and store data for every symbol in metadata."""
+        """Fetch and store data for every symbol in metadata.
+
+        Symbols already in the database are only fetched from the day after
+        their latest stored date; symbols that are up to date are skipped.
+        The rest are downloaded `batch_size` at a time with one yfinance call
+        per batch, and each batch is written with a single bulk upsert.
+        """
         end_date = end_date or datetime.now()
         start_date = start_date or end_date - timedelta(days=365 * 10)
 
         logger.info(
             f"fetching from {start_date.date()} to {end_date.date()} "
-            f"(delay {delay}s)"
+            f"(batch size {batch_size}, delay {delay}s)"
         )
 
         symbols = self.get_stock_symbols(table_name, symbol_column)
         if not symbols:
             return
 
+        # Group symbols by their effective start so each batch shares one date range
+        latest = self.get_latest_dates()
+        pending: Dict[datetime, List[str]] = {}
+        up_to_date = 0
+        for sym in symbols:
+            sym_start = start_date
+            if sym in latest:
+                sym_start = max(start_date, datetime.fromisoformat(latest[sym]) + timedelta(days=1))
+            if sym_start >= end_date:
+                up_to_date += 1
+                continue
+            pending.setdefault(sym_start, []).append(sym)
+
+        batches = [
+            (batch_start, syms[i:i + batch_size])
+            for batch_start, syms in pending.items()
+            for i in range(0, len(syms), batch_size)
+        ]
+
         success = fail = 0
-        for i, sym in enumerate(symbols, 1):
-            logger.info(f"{sym} ({i}/{len(symbols)})")
-            df = self.fetch_stock_data(sym, start_date, end_date)
+        for n, (batch_start, batch) in enumerate(batches, 1):
+            logger.info(
+                f"{batch[0]}..{batch[-1]} from {batch_start.date()} "
+                f"(batch {n}/{len(batches)})"
+            )
+            df = self.fetch_stock_data_batch(batch, batch_start, end_date)
+            saved = 0
             if df is not None and not df.empty:
                 self.save_stock_data(df)
-                success += 1
-            else:
-                fail += 1
-            if i < len(symbols):
+                saved = df["Symbol"].nunique()
+            success += saved
+            fail += len(batch) - saved
+            if n < len(batches):
                 time.sleep(delay)
 
-        logger.info(f"done - success: {success} | fail: {fail}")
+        logger.info(f"done - success: {success} | fail: {fail} | up to date: {up_to_date}")
+
+    def get_latest_dates(self) -> Dict[str, str]:
+        """Return the latest stored date (YYYY-MM-DD) for every symbol."""
+        cur = self.conn.cursor()
+        cur.execute(
+            "SELECT symbol, MAX(date) FROM historical_stock_data GROUP BY symbol"
+        )
+        return dict(cur.fetchall())
 
     def get_statistics(self):
         cur = self.conn.cursor()
@@ -214,6 +262,7 @@ if __name__ == "__main__":
             table_name="stock_metadata",
             symbol_column="symbol",
             delay=1.5,
+            batch_size=100,
         )
         fetcher.get_statistics()
     finally:
@@ -1,15 +1,24 @@
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 
+import numpy as np
 import pandas as pd
+import requests
+from finvizfinance import util as finviz_util
 from finvizfinance.screener.financial import Financial
 from finvizfinance.screener.overview import Overview
 from finvizfinance.screener.ownership import Ownership
 from finvizfinance.screener.technical import Technical
 from finvizfinance.screener.valuation import Valuation
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 
-CACHE_FILE = "finviz_screener_cache_enhanced.csv"
+CACHE_FILE = "finviz_screener_cache_enhanced.parquet"
 OUTPUT_FILE = "finviz_minervini_tickers.csv"
+SCREENER_CACHE_DIR = "_cache"
+CACHE_TTL_SECONDS = 12 * 60 * 60  # screener data is refreshed at most twice a day
 
 FINVIZ_FILTERS = {
     "Market Cap.": "+Mid (over $2bln)",    # cap_midover
@@ -26,6 +35,9 @@ SCREENER_CONFIGS = [
     ("ownership", "Ownership", Ownership),
 ]
 
+# Low-cardinality text columns stored as pandas categories (integer codes + dictionary)
+CATEGORY_COLUMNS = ["Sector", "Industry", "Country", "Index", "Exchange"]
+
 BASIC_COLUMNS = ["Ticker", "Company", "Sector", "Industry"]
 PRICE_COLUMNS = ["Price", "Change", "Market Cap"]
 VOLUME_VARIANTS = [
@@ -139,6 +151,17 @@ POST_TARGET_COLUMN_GROUPS = [
     ("Additional metrics", ADDITIONAL_VARIANTS),
 ]
 
+# Columns that should be numeric even when a screener returns them as text
+# ("12.3%", "1.2B", "300K"). Percentages follow finvizfinance and become fractions.
+NUMERIC_COLUMNS = (
+    PRICE_COLUMNS + VOLUME_VARIANTS + EARNINGS_GROWTH_VARIANTS
+    + SALES_GROWTH_VARIANTS + TARGET_PRICE_VARIANTS
+)
+NUMERIC_PREFIXES = ("EPS growth", "Sales growth")
+NUMBER_SCALES = {"%": 0.01, "K": 1e3, "M": 1e6, "B": 1e9, "T": 1e12}
+# Raw dollar and share counts need more than float32's ~7 significant digits
+FLOAT64_COLUMNS = ["Market Cap"] + VOLUME_VARIANTS
+
 MINERVINI_CRITERIA = {
     "Earnings Growth": lambda df: [
         col for col in df.columns if "EPS" in col and "growth" in col.lower()
@@ -160,7 +183,7 @@ MINERVINI_CRITERIA = {
 }
 
 
-def get_finviz_tickers_with_filters(use_cache=True):
+def get_finviz_tickers_with_filters(use_cache=True, verbose=True):
     """
     Get tickers from FinViz with filters matching:
     https://finviz.com/screener.ashx?v=211&f=cap_midover%2Cipodate_more10%2Csh_avgvol_o300%2Csh_price_o7&ft=4
@@ -179,13 +202,23 @@ def get_finviz_tickers_with_filters(use_cache=True):
     - And other relevant technical/fundamental indicators
 
     Args:
-        use_cache (bool): If True, uses cached data if available to avoid refetching
+        use_cache (bool): If True, uses cached data younger than CACHE_TTL_SECONDS
+            to avoid refetching. Each screener is cached separately, so only the
+            stale or missing ones are downloaded again.
+        verbose (bool): If False, skips the cache and column-selection reports
     """
-    if use_cache and os.path.exists(CACHE_FILE):
-        df = load_cached_screener_data(CACHE_FILE)
-        return save_selected_columns(df, OUTPUT_FILE)
-
-    screeners_data = fetch_all_screeners(FINVIZ_FILTERS)
+    if use_cache and is_cache_fresh(CACHE_FILE):
+        # The filtered CSV is already derived from this cache, nothing to redo
+        if os.path.exists(OUTPUT_FILE) and os.path.getmtime(OUTPUT_FILE) >= os.path.getmtime(CACHE_FILE):
+            if verbose:
+                print(f"Filtered tickers are up to date: {OUTPUT_FILE}")
+            # CSV drops the dtypes, so restore the ones the merged frame carries
+            return apply_column_types(pd.read_csv(OUTPUT_FILE))
+
+        df = load_cached_screener_data(CACHE_FILE, verbose)
+        return save_selected_columns(df, OUTPUT_FILE, verbose)
+
+    screeners_data = fetch_all_screeners(FINVIZ_FILTERS, use_cache=use_cache)
     if not screeners_data:
         print("ERROR: No screener data was successfully fetched.")
         return pd.DataFrame()
@@ -195,39 +228,93 @@ def get_finviz_tickers_with_filters(use_cache=True):
         return pd.DataFrame()
 
     print_combined_dataset_summary(df)
-    df.to_csv(CACHE_FILE, index=False)
+    df.to_parquet(CACHE_FILE, index=False, compression="zstd")
     print(f"\nRaw data saved to cache: {CACHE_FILE}")
 
-    return save_selected_columns(df, OUTPUT_FILE)
+    return save_selected_columns(df, OUTPUT_FILE, verbose)
+
 
+def is_cache_fresh(path, ttl=CACHE_TTL_SECONDS):
+    return os.path.exists(path) and time.time() - os.path.getmtime(path) < ttl
 
-def load_cached_screener_data(cache_file):
-    print(f"Loading from cache file: {cache_file}")
-    df = pd.read_csv(cache_file)
-    print(f"Cache contains {len(df)} tickers with columns: {', '.join(df.columns)}")
+
+def load_cached_screener_data(cache_file, verbose=True):
+    df = pd.read_parquet(cache_file)
+    if verbose:
+        print(f"Loaded cache file: {cache_file}")
+        print(f"Cache contains {len(df)} tickers with columns: {', '.join(df.columns)}")
     return df
 
 
-def save_selected_columns(df, output_file):
-    filtered_df = select_desired_columns(df)
+def save_selected_columns(df, output_file, verbose=True):
+    filtered_df = select_desired_columns(df, verbose)
     filtered_df.to_csv(output_file, index=False)
-    print(f"Filtered tickers saved to: {output_file}")
+    if verbose:
+        print(f"Filtered tickers saved to: {output_file}")
     return filtered_df
 
 
-def fetch_all_screeners(filters_dict):
+def fetch_all_screeners(filters_dict, use_cache=True):
     print("=" * 60)
     print("Fetching data from Finviz screeners")
     print("=" * 60)
 
+    # All screeners and their result pages share one keep-alive connection pool.
+    finviz_util.set_session(create_http_session(pool_size=len(SCREENER_CONFIGS)))
+
+    # The screeners are independent HTTP requests, so fetch them all at once.
+    # Results are collected in SCREENER_CONFIGS order to keep the merge base stable.
+    with ThreadPoolExecutor(max_workers=len(SCREENER_CONFIGS)) as executor:
+        futures = [
+            (name, executor.submit(
+                load_or_fetch_screener, name, index, display_name, screener_cls, filters_dict, use_cache
+            ))
+            for index, (name, display_name, screener_cls) in enumerate(SCREENER_CONFIGS, 1)
+        ]
+
     screeners_data = {}
-    for index, (name, display_name, screener_cls) in enumerate(SCREENER_CONFIGS, 1):
-        df = fetch_screener_data(index, display_name, screener_cls, filters_dict)
+    for name, future in futures:
+        df = future.result()
         if df is not None:
             screeners_data[name] = df
     return screeners_data
 
 
+def create_http_session(pool_size):
+    """
+    Build a requests session whose pooled connections are reused across
+    screener pages, so each page skips the TCP and TLS handshake. Only failed
+    connections are retried. HTTP errors such as 429 go straight back to
+    finvizfinance, whose own retry loop handles them, so a rate-limited page
+    is not re-requested from two layers.
+    """
+    retry = Retry(connect=3, read=0, status=0, backoff_factor=0.3)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=2 * pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def load_or_fetch_screener(name, index, display_name, screener_cls, filters_dict, use_cache=True):
+    """
+    Return one screener's data from its own Parquet cache while it is fresh,
+    otherwise fetch it from Finviz and refresh that cache file. A failed
+    screener leaves the caches of the others untouched.
+    """
+    cache_path = os.path.join(SCREENER_CACHE_DIR, f"{name}.parquet")
+    if use_cache and is_cache_fresh(cache_path):
+        df = pd.read_parquet(cache_path)
+        print(f"{index}. Loaded {display_name} screener from cache ({len(df)} stocks)")
+        return df
+
+    df = fetch_screener_data(index, display_name, screener_cls, filters_dict)
+    if df is not None:
+        os.makedirs(SCREENER_CACHE_DIR, exist_ok=True)
+        df.to_parquet(cache_path, index=False, compression="zstd")
+    return df
+
+
 def fetch_screener_data(index, display_name, screener_cls, filters_dict):
     print(f"{index}. Fetching {display_name} screener data...")
     try:
@@ -247,52 +334,112 @@ def merge_screener_data(screeners_data):
     print("Combining screener data")
     print("=" * 60)
 
-    base_name, base_df = find_base_screener(screeners_data)
-    if base_df is None:
+    frames = []
+    seen_columns = set()
+    for name, df in screeners_data.items():
+        if df is None or len(df) == 0:
+            continue
+        frames.append(prepare_screener_frame(name, df, seen_columns, is_base=not frames))
+
+    if not frames:
         print("ERROR: No valid base dataframe found.")
         return pd.DataFrame()
 
-    for name, df in screeners_data.items():
-        if name == base_name or df is None or len(df) == 0:
-            continue
-        base_df = merge_single_screener(base_df, name, df)
+    # Tickers are unique per frame and columns never overlap, so the frames can be
+    # stitched side by side on the Ticker index without a hash join
+    merged_df = pd.concat(frames, axis=1, join="outer", sort=True)
+    print(
+        "\nMerge complete. Combined dataframe has "
+        f"{len(merged_df)} rows and {len(merged_df.columns)} columns"
+    )
+    return apply_column_types(merged_df.reset_index())
 
-    return base_df
 
+def apply_column_types(df):
+    """
+    Give a screener frame its final dtypes: numeric text parsed, floats
+    downcast and descriptive columns stored as categories. Used for freshly
+    merged data and for the filtered CSV read back from disk alike.
+    """
+    df = normalize_numeric_columns(df)
+    df = downcast_numeric_columns(df)
+    return as_category_columns(df)
 
-def find_base_screener(screeners_data):
-    for name, df in screeners_data.items():
-        if df is not None and len(df) > 0:
-            print(f"Using {name} screener as base with {len(df)} stocks")
-            return name, df.copy()
-    return None, None
 
+def normalize_numeric_columns(df):
+    """
+    Convert the known numeric columns that are still text in one vectorized
+    pass per column, so later filters work on float arrays instead of strings.
+    """
+    numeric_columns = [
+        col for col in df.columns
+        if (col in NUMERIC_COLUMNS or col.startswith(NUMERIC_PREFIXES))
+        and not pd.api.types.is_numeric_dtype(df[col])
+    ]
+    for col in numeric_columns:
+        df[col] = to_number(df[col])
+    return df
 
-def merge_single_screener(base_df, name, df):
-    print(f"\nMerging {name} screener data...")
 
-    base_tickers = set(base_df["Ticker"].tolist())
-    merge_tickers = set(df["Ticker"].tolist())
-    common_tickers = base_tickers.intersection(merge_tickers)
+def downcast_numeric_columns(df):
+    """
+    Store ratios, percentages and prices as float32 and integers in the
+    smallest type that fits, halving the memory and Parquet size of the
+    numeric block. Dollar amounts and share counts stay float64.
+    """
+    float_columns = [
+        col for col in df.select_dtypes("float64").columns if col not in FLOAT64_COLUMNS
+    ]
+    if float_columns:
+        df[float_columns] = df[float_columns].astype(np.float32)
+    for col in df.select_dtypes("int64").columns:
+        df[col] = pd.to_numeric(df[col], downcast="integer")
+    return df
 
-    print(f"   Base has {len(base_tickers)} tickers, {name} has {len(merge_tickers)} tickers")
-    print(f"   Common tickers: {len(common_tickers)}")
 
-    try:
-        merged_df = pd.merge(base_df, df, on="Ticker", how="outer", suffixes=("", f"_{name}"))
-        duplicate_columns = [col for col in merged_df.columns if col.endswith(f"_{name}")]
+def to_number(series):
+    text = series.astype("string").str.strip().str.replace(",", "", regex=False)
+    suffix = text.str[-1]
+    has_suffix = suffix.isin(NUMBER_SCALES)
+    scale = suffix.map(NUMBER_SCALES).astype("float64").fillna(1.0)
+    values = pd.to_numeric(text.where(~has_suffix, text.str[:-1]), errors="coerce")
+    return values.astype("float64") * scale
+
+
+def as_category_columns(df):
+    """
+    Store the repetitive descriptive columns as categories. Parquet keeps them
+    dictionary-encoded, so the cache stays small and loads back as categories.
+    """
+    category_columns = [col for col in CATEGORY_COLUMNS if col in df.columns]
+    if category_columns:
+        df[category_columns] = df[category_columns].astype("category")
+    return df
+
+
+def prepare_screener_frame(name, df, seen_columns, is_base):
+    """
+    Index one screener by Ticker and drop the columns an earlier screener
+    already provided, so the final concat never allocates duplicate columns.
+    A screener listing a ticker twice is rejected, since the one-row-per-ticker
+    concat would otherwise misalign or silently pick one of the rows.
+    """
+    frame = df.set_index("Ticker")
+    if not frame.index.is_unique:
+        duplicates = frame.index[frame.index.duplicated()].unique()
+        raise ValueError(f"{name} screener returned duplicate tickers: {', '.join(map(str, duplicates))}")
+    duplicate_columns = [col for col in frame.columns if col in seen_columns]
+
+    if is_base:
+        print(f"Using {name} screener as base with {len(frame)} stocks")
+    else:
+        print(f"\nMerging {name} screener data...")
+        print(f"   {name} has {len(frame)} tickers")
         if duplicate_columns:
-            merged_df = merged_df.drop(columns=duplicate_columns)
             print(f"   Dropped duplicate columns: {', '.join(duplicate_columns)}")
 
-        print(
-            "   Merge complete. Combined dataframe now has "
-            f"{len(merged_df)} rows and {len(merged_df.columns)} columns"
-        )
-        return merged_df
-    except Exception as e:
-        print(f"   ERROR: Failed to merge {name} screener: {e}")
-        return base_df
+    seen_columns.update(frame.columns)
+    return frame.drop(columns=duplicate_columns)
 
 
 def print_combined_dataset_summary(df):
@@ -302,105 +449,112 @@ def print_combined_dataset_summary(df):
     print(f"   All columns: {', '.join(sorted(df.columns))}")
 
 
-def select_desired_columns(df):
+def select_desired_columns(df, verbose=True):
     """
     Select and reorder the desired columns from the dataframe.
     Focus on Mark Minervini-style growth stock metrics.
 
     Args:
         df: pandas DataFrame with all the columns
+        verbose: If False, the column-by-column report is not built or printed
 
     Returns:
         DataFrame with only the desired columns for growth stock analysis
     """
-    print("\n" + "=" * 60)
-    print("Selecting Minervini-style growth stock columns")
-    print("=" * 60)
+    # Collect the report and write it once instead of one stdout write per column
+    lines = []
+    report = lines.append if verbose else (lambda line: None)
+    report("\n" + "=" * 60)
+    report("Selecting Minervini-style growth stock columns")
+    report("=" * 60)
 
     columns_to_keep = []
-
-    add_required_columns(columns_to_keep, df, BASIC_COLUMNS)
-    add_required_columns(columns_to_keep, df, PRICE_COLUMNS)
-    add_first_matching_column(columns_to_keep, df, VOLUME_VARIANTS, "Average Volume")
-    add_column_groups(columns_to_keep, df)
-    add_target_price_column(columns_to_keep, df)
-    add_column_groups(columns_to_keep, df, POST_TARGET_COLUMN_GROUPS)
-
-    filtered_df = build_filtered_dataframe(df, columns_to_keep)
-    print_filtered_summary(filtered_df)
+    available = set(df.columns)
+
+    add_required_columns(columns_to_keep, available, BASIC_COLUMNS, report)
+    add_required_columns(columns_to_keep, available, PRICE_COLUMNS, report)
+    add_first_matching_column(columns_to_keep, available, VOLUME_VARIANTS, "Average Volume", report)
+    add_column_groups(columns_to_keep, available, report=report)
+    add_target_price_column(columns_to_keep, available, report)
+    add_column_groups(columns_to_keep, available, POST_TARGET_COLUMN_GROUPS, report)
+
+    filtered_df = build_filtered_dataframe(df, columns_to_keep, report)
+    print_filtered_summary(filtered_df, report)
+    if lines:
+        print("\n".join(lines))
     return filtered_df
 
 
-def add_required_columns(columns_to_keep, df, candidates):
+def add_required_columns(columns_to_keep, available, candidates, report=print):
     for column in candidates:
-        if column in df.columns:
+        if column in available:
             columns_to_keep.append(column)
-            print(f"Found: {column}")
+            report(f"Found: {column}")
         else:
-            print(f"Missing: {column}")
+            report(f"Missing: {column}")
 
 
-def add_first_matching_column(columns_to_keep, df, candidates, label):
-    for column in candidates:
-        if column in df.columns:
-            columns_to_keep.append(column)
-            print(f"Found: {label} (as '{column}')")
-            return
-    print(f"Missing: {label}")
+def add_first_matching_column(columns_to_keep, available, candidates, label, report=print):
+    column = next((c for c in candidates if c in available), None)
+    if column is None:
+        report(f"Missing: {label}")
+        return
+    columns_to_keep.append(column)
+    report(f"Found: {label} (as '{column}')")
 
 
-def add_column_groups(columns_to_keep, df, column_groups=COLUMN_GROUPS):
+def add_column_groups(columns_to_keep, available, column_groups=COLUMN_GROUPS, report=print):
     for title, candidates in column_groups:
-        print(f"\n{title}:")
-        add_existing_columns(columns_to_keep, df, candidates)
+        report(f"\n{title}:")
+        add_existing_columns(columns_to_keep, available, candidates, report)
 
 
-def add_existing_columns(columns_to_keep, df, candidates):
+def add_existing_columns(columns_to_keep, available, candidates, report=print):
     for column in candidates:
-        if column in df.columns:
+        if column in available:
             columns_to_keep.append(column)
-            print(f"Found: {column}")
+            report(f"Found: {column}")
 
 
-def add_target_price_column(columns_to_keep, df):
-    print("\nTarget price:")
-    for column in TARGET_PRICE_VARIANTS:
-        if column in df.columns:
-            columns_to_keep.append(column)
-            print(f"Found: {column}")
-            return
-    print("Missing: Target Price")
+def add_target_price_column(columns_to_keep, available, report=print):
+    report("\nTarget price:")
+    column = next((c for c in TARGET_PRICE_VARIANTS if c in available), None)
+    if column is None:
+        report("Missing: Target Price")
+        return
+    columns_to_keep.append(column)
+    report(f"Found: {column}")
 
 
-def build_filtered_dataframe(df, columns_to_keep):
+def build_filtered_dataframe(df, columns_to_keep, report=print):
     if not columns_to_keep:
-        print("WARNING: Could not find any of the desired columns. Keeping all columns.")
+        report("WARNING: Could not find any of the desired columns. Keeping all columns.")
         return df
 
     selected_columns = list(dict.fromkeys(columns_to_keep))
-    filtered_df = df[selected_columns]
+    filtered_df = df.loc[:, selected_columns]
 
-    print(f"\nSelected columns ({len(selected_columns)} total):")
+    report(f"\nSelected columns ({len(selected_columns)} total):")
     for index, column in enumerate(selected_columns, 1):
-        print(f"   {index:2d}. {column}")
+        report(f"   {index:2d}. {column}")
 
     return filtered_df
 
 
-def print_filtered_summary(filtered_df):
+def print_filtered_summary(filtered_df, report=print):
     if "Ticker" not in filtered_df.columns:
         return
 
     tickers = filtered_df["Ticker"].tolist()
-    print("\nSummary:")
-    print(f"   Total stocks found: {len(tickers)}")
-    print(f"   Total data columns: {len(filtered_df.columns)}")
+    report("\nSummary:")
+    report(f"   Total stocks found: {len(tickers)}")
+    report(f"   Total data columns: {len(filtered_df.columns)}")
 
     if tickers:
         example_tickers = tickers[:10] if len(tickers) >= 10 else tickers
-        print(f"   Example tickers: {', '.join(example_tickers)}")
+        report(f"   Example tickers: {', '.join(example_tickers)}")
         if len(tickers) > 10:
-            print(f"   ... and {len(tickers) - 10} more")
+            report(f"   ... and {len(tickers) - 10} more")
 
 
 def analyze_minervini_criteria(df):
@@ -11,63 +11,102 @@ WINDOW_DAYS = 5
 def check_ten_year_data(ticker):
     """
     Check if Yahoo Finance has price data near the 10-year lookback date.
-    
+
     Args:
         ticker (str): Stock ticker symbol.
-    
+
     Returns:
         str: Human-readable summary of the available history.
     """
     ticker = ticker.strip().upper()
-    
+    return check_ten_year_data_batch([ticker])[ticker]
+
+
+def check_ten_year_data_batch(tickers):
+    """
+    Check several tickers for price data near the 10-year lookback date.
+
+    All tickers are fetched with a single yfinance download call, which
+    batches the requests instead of issuing one round trip per ticker.
+
+    Args:
+        tickers (list[str]): Stock ticker symbols.
+
+    Returns:
+        dict[str, str]: Human-readable summary of the available history per ticker.
+    """
+    tickers = list(dict.fromkeys(ticker.strip().upper() for ticker in tickers))
+
     try:
         today = datetime.now().date()
         ten_years_ago = today.replace(year=today.year - 10)
-        
+
         # Use a small window to account for weekends and market holidays.
         start_date = ten_years_ago - timedelta(days=WINDOW_DAYS)
         end_date = ten_years_ago + timedelta(days=WINDOW_DAYS)
-        
-        stock = yf.Ticker(ticker)
-        data = stock.history(start=start_date, end=end_date)
-        
-        if data.empty:
-            return (
-                f"No data found for {ticker} around {ten_years_ago} "
-                f"(+/- {WINDOW_DAYS} days)"
-            )
-        
-        result = f"Ticker: {ticker}\n"
-        result += f"Checking for data around: {ten_years_ago}\n"
-        
-        available_dates = data.index.date
-        
-        if len(available_dates) > 0:
-            closest_date = min(available_dates, key=lambda d: abs((d - ten_years_ago).days))
-            days_off = abs((closest_date - ten_years_ago).days)
-            
-            result += f"Data found. Closest date to target: {closest_date}\n"
-            result += f"   ({days_off} days from exact 10-year mark)"
-        else:
-            result += f"No data found in the +/- {WINDOW_DAYS}-day window"
-            
-        return result
-        
+
+        data = yf.download(
+            tickers,
+            start=start_date,
+            end=end_date,
+            group_by="ticker",
+            auto_adjust=False,
+            threads=True,
+            progress=False,
+        )
     except Exception as e:
-        return f"Error checking data for {ticker}: {str(e)}"
+        return {ticker: f"Error checking data for {ticker}: {str(e)}" for ticker in tickers}
+
+    downloaded = set(data.columns.get_level_values(0)) if data is not None else set()
+    results = {}
+    for ticker in tickers:
+        ticker_data = data[ticker].dropna(how="all") if ticker in downloaded else None
+        results[ticker] = summarize_history(ticker, ticker_data, ten_years_ago)
+    return results
+
+
+def summarize_history(ticker, data, ten_years_ago):
+    """
+    Describe how close the downloaded history gets to the 10-year mark.
+
+    Args:
+        ticker (str): Stock ticker symbol.
+        data (pd.DataFrame | None): Price history downloaded for the ticker.
+        ten_years_ago (date): Target lookback date.
+
+    Returns:
+        str: Human-readable summary of the available history.
+    """
+    if data is None or data.empty:
+        return (
+            f"No data found for {ticker} around {ten_years_ago} "
+            f"(+/- {WINDOW_DAYS} days)"
+        )
+
+    result = f"Ticker: {ticker}\n"
+    result += f"Checking for data around: {ten_years_ago}\n"
+
+    available_dates = data.index.date
+    closest_date = min(available_dates, key=lambda d: abs((d - ten_years_ago).days))
+    days_off = abs((closest_date - ten_years_ago).days)
+
+    result += f"Data found. Closest date to target: {closest_date}\n"
+    result += f"   ({days_off} days from exact 10-year mark)"
+    return result
 
 
 def parse_args():
     parser = argparse.ArgumentParser(
-        description="Check whether a ticker has price data from around 10 years ago."
+        description="Check whether tickers have price data from around 10 years ago."
     )
-    parser.add_argument("ticker", type=str, help="Stock ticker symbol")
+    parser.add_argument("tickers", nargs="+", type=str, help="Stock ticker symbol(s)")
     return parser.parse_args()
 
 
 def main():
     args = parse_args()
-    print(check_ten_year_data(args.ticker))
+    results = check_ten_year_data_batch(args.tickers)
+    print("\n\n".join(results.values()))
 
 
 if __name__ == "__main__":
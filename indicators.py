@@ -1,62 +1,183 @@
+import numpy as np
 import pandas as pd
 import talib
+from numba import njit, types
+
+# Kernel signature: read-only contiguous input (pandas copy-on-write hands out
+# read-only arrays; writable arrays are accepted too), period, contiguous output.
+_KERNEL_SIGNATURE = types.void(
+    types.Array(types.float64, 1, "C", readonly=True), types.int64, types.float64[::1]
+)
+# fastmath without 'nnan'/'ninf': the kernels write NaN warm-up values and may see NaN prices
+_FASTMATH = {"nsz", "arcp", "contract", "afn", "reassoc"}
+
+
+@njit(_KERNEL_SIGNATURE, cache=True, nogil=True, fastmath=_FASTMATH, boundscheck=False)
+def _rsi(close, period, out):
+    """
+    Single-pass Wilder RSI written into `out`, seeded like TA-Lib with the simple
+    average of the first `period` price changes after any leading NaNs.
+    A NaN price later in the series leaves every following value NaN.
+    """
+    n = len(close)
+    out[:] = np.nan
+    start = 0
+    while start < n and np.isnan(close[start]):
+        start += 1
+    if period < 1 or n - start <= period:
+        return
+
+    gain = 0.0
+    loss = 0.0
+    for i in range(start + 1, start + period + 1):
+        diff = close[i] - close[i - 1]
+        if diff > 0:
+            gain += diff
+        else:
+            loss -= diff
+    gain /= period
+    loss /= period
+
+    total = gain + loss
+    if total >= 1e-8:
+        out[start + period] = 100.0 * gain / total
+    elif not np.isnan(total):
+        out[start + period] = 0.0
+
+    for i in range(start + period + 1, n):
+        diff = close[i] - close[i - 1]
+        gain *= period - 1
+        loss *= period - 1
+        if diff > 0:
+            gain += diff
+        else:
+            loss -= diff
+        gain /= period
+        loss /= period
+
+        total = gain + loss
+        if total >= 1e-8:
+            out[i] = 100.0 * gain / total
+        elif not np.isnan(total):  # a NaN price poisons the averages, so out[i] stays NaN
+            out[i] = 0.0
+
+
+@njit(_KERNEL_SIGNATURE, cache=True, nogil=True, fastmath=_FASTMATH, boundscheck=False)
+def _sma(close, period, out):
+    """
+    Simple moving average written into `out` from prefix sums in one O(N) pass.
+    Leading NaNs are skipped like TA-Lib does, so they do not poison the sums.
+    """
+    n = len(close)
+    out[:] = np.nan
+    start = 0
+    while start < n and np.isnan(close[start]):
+        start += 1
+    if period < 1 or n - start < period:
+        return
+
+    csum = np.empty(n - start + 1)
+    csum[0] = 0.0
+    csum[1:] = np.cumsum(close[start:])
+    out[start + period - 1:] = (csum[period:] - csum[:-period]) / period
+
 
 class Indicators:
     @staticmethod
-    def calculate_rsi(series: pd.Series, period: int = 10) -> pd.Series:
+    def calculate_rsi(values: np.ndarray, period: int = 10) -> np.ndarray:
         """
-        Calculates RSI (Relative Strength Index) and returns it as a Series.
+        Calculates RSI (Relative Strength Index) and returns it as an array.
 
-        :param series: Series of price data (e.g., closing prices).
+        :param values: array of price data (e.g., closing prices); widened to float64 for TA-Lib.
         :param period: RSI calculation period.
-        :return: RSI values as a Series.
+        :return: RSI values as an array.
         """
-        return talib.RSI(series, timeperiod=period)
+        return talib.RSI(np.asarray(values, dtype=np.float64), timeperiod=period)
 
     @staticmethod
-    def add_rsi(dataFrame: pd.DataFrame, period: int = 10, column: str = 'Close') -> pd.DataFrame:
+    def calculate_rsi_fast(values: np.ndarray, period: int = 10) -> np.ndarray:
+        """
+        Calculates Wilder RSI with the cached Numba kernel instead of TA-Lib.
+        Matches `calculate_rsi` to floating-point rounding and skips the TA-Lib
+        call and input validation overhead on short per-ticker series. After a
+        NaN price mid-series it returns NaN where TA-Lib writes 0. The kernel
+        releases the GIL, so per-ticker threads run it in parallel.
+
+        :param values: array of price data (e.g., closing prices).
+        :param period: RSI calculation period.
+        :return: RSI values as a float64 array.
+        """
+        close = np.ascontiguousarray(values, dtype=np.float64)
+        rsi_values = np.empty_like(close)
+        _rsi(close, period, rsi_values)
+        return rsi_values
+
+    @staticmethod
+    def add_rsi(dataFrame: pd.DataFrame, period: int = 10, column: str = 'Close',
+                copy: bool = False) -> pd.DataFrame:
         """
         Adds RSI to the DataFrame using the specified column.
+        The DataFrame is updated in place and returned unless `copy` is set.
 
         :param dataFrame: DataFrame containing price data.
         :param period: RSI calculation period.
         :param column: Column used for RSI calculation.
+        :param copy: Work on a copy and leave the caller's DataFrame untouched.
         :return: DataFrame with RSI column added.
         """
-        dataFrame = dataFrame.copy()
+        if copy:
+            dataFrame = dataFrame.copy()
         if isinstance(dataFrame.columns, pd.MultiIndex):
             dataFrame.columns = dataFrame.columns.droplevel(1)
 
-        rsi_values = Indicators.calculate_rsi(dataFrame[column], period)
-        dataFrame[f'RSI_{period}'] = rsi_values
+        dataFrame[f'RSI_{period}'] = Indicators.calculate_rsi_fast(dataFrame[column].to_numpy(), period)
         return dataFrame
 
     @staticmethod
-    def calculate_sma(series: pd.Series, period: int = 200) -> pd.Series:
+    def calculate_sma(values: np.ndarray, period: int = 200) -> np.ndarray:
+        """
+        Calculates Simple Moving Average (SMA) and returns it as an array.
+
+        :param values: array of price data; widened to float64 for TA-Lib.
+        :param period: SMA calculation period.
+        :return: SMA values as an array.
+        """
+        return talib.SMA(np.asarray(values, dtype=np.float64), timeperiod=period)
+
+    @staticmethod
+    def calculate_sma_fast(values: np.ndarray, period: int = 200) -> np.ndarray:
         """
-        Calculates Simple Moving Average (SMA) and returns it as a Series.
+        Calculates the SMA with the cached Numba kernel instead of TA-Lib.
+        The kernel releases the GIL, so threads computing indicators for
+        different tickers run in parallel.
 
-        :param series: Series of price data.
+        :param values: array of price data.
         :param period: SMA calculation period.
-        :return: SMA values as a Series.
+        :return: SMA values as a float64 array.
         """
-        return talib.SMA(series, timeperiod=period)
+        close = np.ascontiguousarray(values, dtype=np.float64)
+        sma_values = np.empty_like(close)
+        _sma(close, period, sma_values)
+        return sma_values
 
     @staticmethod
-    def add_sma(dataFrame: pd.DataFrame, period: int = 200, column: str = 'Close') -> pd.DataFrame:
+    def add_sma(dataFrame: pd.DataFrame, period: int = 200, column: str = 'Close',
+                copy: bool = False) -> pd.DataFrame:
         """
         Adds SMA to the DataFrame using the specified column.
+        The DataFrame is updated in place and returned unless `copy` is set.
 
         :param dataFrame: DataFrame containing price data.
         :param period: SMA calculation period.
         :param column: Column used for SMA calculation.
+        :param copy: Work on a copy and leave the caller's DataFrame untouched.
         :return: DataFrame with SMA column added.
         """
-        dataFrame = dataFrame.copy()
+        if copy:
+            dataFrame = dataFrame.copy()
         if isinstance(dataFrame.columns, pd.MultiIndex):
             dataFrame.columns = dataFrame.columns.droplevel(1)
 
-        sma_values = Indicators.calculate_sma(dataFrame[column], period)
-        dataFrame[f'SMA_{period}'] = sma_values
+        dataFrame[f'SMA_{period}'] = Indicators.calculate_sma_fast(dataFrame[column].to_numpy(), period)
         return dataFrame
 
@@ -4,37 +4,65 @@ The script loads filtered stock data, runs the configured SMA variants in
 parallel, and sends the nested results to the reporter.
 """
 
+import os
+
+import numpy as np
+
 from dataHandler import DataHandler
+from indicators import Indicators
 from strategyManager import StrategyManager
-from performanceAnalyzer import PerformanceAnalyzer
+from performanceAnalyzer import compute_stats
 from reporter import Reporter
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 
 # Backtest configuration for the demo run.
 SMA_PERIODS = [100, 200]
 LARGE_CAP_MIN_MARKET_CAP = 10_000_000_000  # 10 Billion
-MAX_WORKERS = 4
+MAX_WORKERS = os.cpu_count() or 1
 STRATEGY_NAME = "RSI_SMA"
 RSI_PERIOD = 10
 
 
-def execute_backtest_thread(ticker, df, strategy_name, params):
-    """Run a single ticker backtest.
+def execute_backtest_thread(ticker, df, strategy_name, params_list):
+    """Run every parameter set for a single ticker backtest.
+
+    RSI and SMA series are computed once per distinct period and shared by
+    all parameter sets, so the price column is only scanned once per period.
 
     Args:
         ticker: Stock symbol used as the result key.
         df: Historical price data for the ticker.
         strategy_name: Strategy identifier passed to StrategyManager.
-        params: Strategy parameters for this run.
+        params_list: Strategy parameter sets to run.
 
     Returns:
-        A tuple containing the ticker, summary statistics, and generated trades.
+        A tuple containing the ticker and a dictionary keyed by SMA period with
+        the summary statistics and generated trades of each run.
     """
-    manager = StrategyManager(df, strategy_name, params)
-    trades = manager.run_backtest()
-    analyzer = PerformanceAnalyzer(trades)
-    return ticker, analyzer.stats, trades
+    close = df["Close"].to_numpy(dtype=np.float64)
+    rsi_cache = {}
+    sma_cache = {}
+
+    results = {}
+    for params in params_list:
+        rsi_period = params["rsi_period"]
+        sma_period = params["sma_period"]
+        if rsi_period not in rsi_cache:
+            rsi_cache[rsi_period] = Indicators.calculate_rsi_fast(close, period=rsi_period)
+        if sma_period not in sma_cache:
+            sma_cache[sma_period] = Indicators.calculate_sma_fast(close, period=sma_period)
+
+        # assign() gives each run its own frame; under copy-on-write (pandas>=3) the price data is not copied
+        run_df = df.assign(**{
+            f"RSI_{rsi_period}": rsi_cache[rsi_period],
+            f"SMA_{sma_period}": sma_cache[sma_period],
+        })
+        manager = StrategyManager(run_df, strategy_name, params)
+        trades = manager.run_backtest()
+        results[sma_period] = (compute_stats(trades), trades)
+
+    return ticker, results
 
 
 def load_large_cap_data():
@@ -62,35 +90,43 @@ def build_strategy_params(sma_period):
     }
 
 
-def run_backtests_for_sma_period(data_dict, sma_period):
-    """Run all ticker backtests for a single SMA period.
+def run_backtests(data_dict, sma_periods):
+    """Run all ticker backtests for every SMA period.
+
+    Each ticker is submitted once with all SMA periods. Workers are threads:
+    the indicators and the trade loop run in Numba kernels compiled with
+    nogil=True (TA-Lib would hold the GIL), so the price data is shared
+    instead of pickled to worker processes.
 
     Args:
         data_dict: Historical price data keyed by ticker.
-        sma_period: Simple moving average lookback period to test.
+        sma_periods: Simple moving average lookback periods to test.
 
     Returns:
-        Two dictionaries keyed by ticker: summary statistics and raw trades.
+        Two dictionaries keyed by SMA period, then by ticker: summary
+        statistics and raw trades.
     """
-    results = {}
-    trades_dict = {}
+    results = {sma_period: {} for sma_period in sma_periods}
+    trades_dict = {sma_period: {} for sma_period in sma_periods}
+    params_list = [build_strategy_params(sma_period) for sma_period in sma_periods]
 
-    with ProcessPoolExecutor(max_workers=MAX_WORKERS) as executor:
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
         futures = [
             executor.submit(
                 execute_backtest_thread,
                 ticker,
                 df,
                 STRATEGY_NAME,
-                build_strategy_params(sma_period),
+                params_list,
             )
             for ticker, df in data_dict.items()
         ]
 
         for future in as_completed(futures):
-            ticker, stats, trades = future.result()
-            results[ticker] = stats
-            trades_dict[ticker] = trades
+            ticker, ticker_results = future.result()
+            for sma_period, (stats, trades) in ticker_results.items():
+                results[sma_period][ticker] = stats
+                trades_dict[sma_period][ticker] = trades
 
     return results, trades_dict
 
@@ -99,18 +135,13 @@ def main():
     """Run the full backtest workflow and display the final report."""
     data_dict = load_large_cap_data()
 
-    all_results = {}
     print("[INFO] Starting backtests...")
 
     # Keep each SMA period separate so the reporter can compare configurations.
-    for sma_period in SMA_PERIODS:
-        print(f"\n[INFO] Running backtest for SMA period = {sma_period}")
-
-        results, _ = run_backtests_for_sma_period(data_dict, sma_period)
+    all_results, _ = run_backtests(data_dict, SMA_PERIODS)
 
-        print(f"Completed {len(results)}/{len(data_dict)} stocks for SMA {sma_period}")
-
-        all_results[sma_period] = results
+    for sma_period in SMA_PERIODS:
+        print(f"Completed {len(all_results[sma_period])}/{len(data_dict)} stocks for SMA {sma_period}")
 
     reporter = Reporter(all_results)
     reporter.print_summary()
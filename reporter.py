@@ -1,14 +1,13 @@
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-from matplotlib.widgets import Button
 import matplotlib.gridspec as gridspec
 class Reporter:
     """
     Handles reporting and visualization of backtest results.
     """
 
-    def __init__(self, all_results: dict[str, dict[str, float]]):
+    def __init__(self, all_results: dict[int, dict[str, dict[str, float]]]):
         """
         Initialize the Reporter with the list of trades.
 
@@ -17,6 +16,11 @@ class Reporter:
         self.results = all_results
         self.all_results = all_results
         self.current_sma = list(all_results.keys())[0]
+        # Summary and dashboard data per SMA period, built on first use and reused on every redraw
+        self._array_cache: dict[int, tuple[np.ndarray, dict[str, np.ndarray], np.ndarray]] = {}
+        self._df_cache: dict[int, pd.DataFrame] = {}
+        self._kpi_cache: dict[int, tuple[int, float, float]] = {}
+        self._plot_cache: dict[int, dict[str, np.ndarray]] = {}
 
 
     def print_summary(self):
@@ -28,49 +32,28 @@ class Reporter:
             print("No results to summarize.")
             return
 
-        stat_columns = ["win_rate", "avg_rr", "avg_return"]
-
         for sma_period, ticker_results in self.all_results.items():
             title = f"SMA {sma_period} Summary"
             print(f"\n{title}")
             print("-" * len(title))
 
-            invalid_results = []
-            valid_results = []
-
-            for ticker, stats in ticker_results.items():
-                has_invalid_stats = any(
-                    stats.get(column) is None or pd.isna(stats.get(column))
-                    for column in stat_columns
-                )
-
-                if has_invalid_stats:
-                    invalid_results.append((ticker, stats))
-                else:
-                    valid_results.append(stats)
+            tickers, columns, valid = self._stat_arrays(sma_period)
 
-            if invalid_results:
+            invalid = np.flatnonzero(~valid)
+            if invalid.size:
                 print("Invalid stats:")
-                for ticker, stats in invalid_results:
-                    print(f" - {ticker}: {stats}")
+                for i in invalid:
+                    print(f" - {tickers[i]}: {ticker_results[tickers[i]]}")
 
-            total_trades = sum(r.get("total_trades", 0) for r in valid_results)
+            # (n_valid, 3) metrics and trade counts: trade-weighted means are a single matrix-vector product
+            metrics = np.column_stack([columns[column][valid] for column in ("win_rate", "avg_rr", "avg_return")])
+            weights = columns["total_trades"][valid].astype(np.float64)
+            total_trades = int(weights.sum())
 
-            win_rate = (
-                sum(r["win_rate"] * r["total_trades"] for r in valid_results) / total_trades
-                if total_trades > 0
-                else 0
-            )
-            avg_rr = (
-                sum(r["avg_rr"] * r["total_trades"] for r in valid_results) / total_trades
-                if total_trades > 0
-                else 0
-            )
-            avg_return = (
-                sum(r["avg_return"] * r["total_trades"] for r in valid_results) / total_trades
-                if total_trades > 0
-                else 0
-            )
+            if total_trades > 0:
+                win_rate, avg_rr, avg_return = weights @ metrics / total_trades
+            else:
+                win_rate, avg_rr, avg_return = 0, 0, 0
 
             print(f"Total Trades: {total_trades}")
             print(f"Win Rate: {win_rate:.1%}")
@@ -83,10 +66,41 @@ class Reporter:
         """
         pass
 
-    def _valid_results_df(self) -> pd.DataFrame:
-        df = pd.DataFrame.from_dict(self.results, orient="index")
-        df = df.dropna(subset=["win_rate", "avg_rr", "avg_return"])
-        return df
+    def _stat_arrays(self, sma: int):
+        """
+        Per-ticker stats for one SMA period as column arrays, plus a mask of the
+        tickers whose win rate, risk-reward and return are all present.
+        Built from the results dict in one pass and cached.
+        """
+        if sma not in self._array_cache:
+            ticker_results = self.all_results[sma]
+            tickers = np.array(list(ticker_results), dtype=object)
+            columns = {
+                "total_trades": np.array(
+                    [stats.get("total_trades", 0) for stats in ticker_results.values()], dtype=np.int64
+                )
+            }
+            for column in ("win_rate", "avg_rr", "avg_return"):
+                columns[column] = np.array(
+                    [stats.get(column, np.nan) for stats in ticker_results.values()], dtype=np.float64
+                )
+            valid = ~(np.isnan(columns["win_rate"]) | np.isnan(columns["avg_rr"]) | np.isnan(columns["avg_return"]))
+            self._array_cache[sma] = (tickers, columns, valid)
+        return self._array_cache[sma]
+
+    def _valid_results_df(self, sma: int | None = None) -> pd.DataFrame:
+        """
+        Per-ticker stats for one SMA period (default: `current_sma`) with incomplete rows removed.
+        Built from the cached stat arrays once and cached.
+        """
+        if sma is None:
+            sma = self.current_sma
+        if sma not in self._df_cache:
+            tickers, columns, valid = self._stat_arrays(sma)
+            df = pd.DataFrame({column: values[valid] for column, values in columns.items()}, index=tickers[valid])
+            df["asset_name"] = df.index
+            self._df_cache[sma] = df
+        return self._df_cache[sma]
 
 
 
@@ -101,7 +115,6 @@ class Reporter:
         Features: Fade transitions, Break-even line, and Asset Tooltips.
         """
         # Essential Imports inside the function to prevent NameError
-        from matplotlib.widgets import Button
         import matplotlib.gridspec as gridspec
         from matplotlib.ticker import ScalarFormatter
 
@@ -136,13 +149,41 @@ class Reporter:
             'active_sma': sma_values[0],
             'annot': None,
             'sc': None,
+            'be_line': None,
+            'be_fill': None,
+            'last_ind': -1,
+            'bg': None,
             'df': None
         }
 
-        def get_data(sma):
-            df = pd.DataFrame.from_dict(self.all_results[sma], orient="index")
-            df['asset_name'] = df.index
-            return df.dropna(subset=["win_rate", "avg_rr", "avg_return"])
+        def get_kpis(df, sma):
+            # Trade-weighted headline numbers, computed once per SMA
+            if sma not in self._kpi_cache:
+                self._kpi_cache[sma] = (
+                    int(df["total_trades"].sum()),
+                    np.average(df["win_rate"], weights=df["total_trades"]),
+                    np.average(df["avg_rr"], weights=df["total_trades"]),
+                )
+            return self._kpi_cache[sma]
+
+        def get_plot_arrays(df, sma):
+            # Contiguous arrays and the break-even curve, so redraws never go back to pandas
+            if sma not in self._plot_cache:
+                rr = df["avg_rr"].to_numpy(dtype=np.float64)
+                rr_max = rr.max()
+
+                # Break-even Curve: WinRate = 1 / (RR + 1)
+                rr_range = np.logspace(np.log10(0.4), np.log10(rr_max * 1.5), 100)
+                self._plot_cache[sma] = {
+                    "avg_rr": rr,
+                    "win_rate": df["win_rate"].to_numpy(dtype=np.float64),
+                    "avg_return": df["avg_return"].to_numpy(dtype=np.float64),
+                    "sizes": np.clip(df["total_trades"].to_numpy() * 0.6, 50, 800),
+                    "rr_max": rr_max,
+                    "rr_range": rr_range,
+                    "be_win_rate": 1 / (rr_range + 1),
+                }
+            return self._plot_cache[sma]
 
         def update_ui_text(df, sma):
             title_ax.clear(); title_ax.axis("off")
@@ -152,9 +193,7 @@ class Reporter:
                         fontsize=28, ha="center", va="center", color=TEXT_MAIN, weight='bold')
 
             if not df.empty:
-                trades = int(df["total_trades"].sum())
-                wr = np.average(df["win_rate"], weights=df["total_trades"])
-                rr = np.average(df["avg_rr"], weights=df["total_trades"])
+                trades, wr, rr = get_kpis(df, sma)
 
                 # Large Display KPIs
                 kpi_ax.text(0.15, 0.6, f"{trades:,}", fontsize=48, ha="center", weight='bold', color=TEXT_MAIN)
@@ -166,22 +205,22 @@ class Reporter:
                 kpi_ax.text(0.85, 0.6, f"{rr:.2f}", fontsize=48, ha="center", weight='bold', color=TEXT_MAIN)
                 kpi_ax.text(0.85, 0.1, "AVG RISK-REWARD", fontsize=14, ha="center", color=TEXT_DIM)
 
-        def draw_plot(df, alpha=1.0):
+        def draw_plot(arrays, alpha=1.0):
             scatter_ax.clear()
             
-            # 1. Break-even Curve: WinRate = 1 / (RR + 1)
-            rr_range = np.logspace(np.log10(0.4), np.log10(max(df["avg_rr"]) * 1.5), 100)
-            be_win_rate = 1 / (rr_range + 1)
-            scatter_ax.plot(rr_range, be_win_rate, color=TEXT_MAIN, linestyle="--", alpha=0.3 * alpha)
-            scatter_ax.fill_between(rr_range, be_win_rate, 1, color=ACCENT_PURPLE, alpha=0.03 * alpha)
+            # 1. Break-even Curve (precomputed per SMA)
+            rr_range = arrays["rr_range"]
+            be_win_rate = arrays["be_win_rate"]
+            state['be_line'], = scatter_ax.plot(rr_range, be_win_rate, color=TEXT_MAIN, linestyle="--", alpha=0.3 * alpha)
+            state['be_fill'] = scatter_ax.fill_between(rr_range, be_win_rate, 1, color=ACCENT_PURPLE, alpha=0.03 * alpha)
 
             # 2. Plot Assets
-            sizes = np.clip(df["total_trades"].to_numpy() * 0.6, 50, 800)
             state['sc'] = scatter_ax.scatter(
-                df["avg_rr"], df["win_rate"],
-                s=sizes, c=df["avg_return"],
+                arrays["avg_rr"], arrays["win_rate"],
+                s=arrays["sizes"], c=arrays["avg_return"],
                 cmap="plasma", alpha=alpha, 
-                edgecolors=TEXT_MAIN, linewidths=0.7
+                edgecolors=TEXT_MAIN, linewidths=0.7,
+                rasterized=True  # one bitmap for all markers; axes and text stay vector
             )
 
             # 3. Clean X-Axis (Fixed NameError source)
@@ -189,7 +228,7 @@ class Reporter:
             scatter_ax.xaxis.set_major_formatter(ScalarFormatter())
             scatter_ax.set_xticks([0.5, 1, 2, 5, 10, 20, 50])
             
-            scatter_ax.set_xlim(0.4, max(df["avg_rr"]) * 1.3)
+            scatter_ax.set_xlim(0.4, arrays["rr_max"] * 1.3)
             scatter_ax.set_ylim(0, 1.0)
             
             scatter_ax.grid(True, which="both", linestyle="--", alpha=0.1)
@@ -202,55 +241,121 @@ class Reporter:
                                                 bbox=dict(boxstyle="round", fc=BG_COLOR, ec=ACCENT_PURPLE, alpha=0.9),
                                                 arrowprops=dict(arrowstyle="->", color=ACCENT_PURPLE))
             state['annot'].set_visible(False)
+            state['annot'].set_animated(True)  # drawn by blitting only, see refresh_tooltip
+            state['last_ind'] = -1
+
+        def set_plot_alpha(alpha):
+            state['sc'].set_alpha(alpha)
+            state['be_line'].set_alpha(0.3 * alpha)
+            state['be_fill'].set_alpha(0.03 * alpha)
+
+        def fade(alphas):
+            # Only the fading artists are redrawn per frame, blitted over a cached
+            # background, instead of rebuilding the whole axes for every frame.
+            if not fig.canvas.supports_blit:
+                for a in alphas:
+                    set_plot_alpha(a)
+                    fig.canvas.draw_idle()
+                    fig.canvas.flush_events()
+                return
+
+            artists = (state['be_fill'], state['be_line'], state['sc'])
+            for artist in artists:
+                artist.set_animated(True)  # left out of full draws and of stale tracking
+            fig.canvas.draw()
+            background = fig.canvas.copy_from_bbox(scatter_ax.bbox)
+
+            for a in alphas:
+                set_plot_alpha(a)
+                fig.canvas.restore_region(background)
+                for artist in artists:
+                    scatter_ax.draw_artist(artist)
+                fig.canvas.blit(scatter_ax.bbox)
+                fig.canvas.flush_events()  # paint this frame without spinning the GUI main loop
+
+            for artist in artists:
+                artist.set_animated(False)
 
         # --- Interactivity Handlers ---
+        def on_draw(event):
+            # Every full draw leaves out the tooltip; keep that as the blit background
+            state['bg'] = fig.canvas.copy_from_bbox(fig.bbox)
+            if state['annot'] is not None and state['annot'].get_visible():
+                fig.draw_artist(state['annot'])
+
+        def refresh_tooltip():
+            if state['bg'] is None or not fig.canvas.supports_blit:
+                fig.canvas.draw_idle()
+                return
+            fig.canvas.restore_region(state['bg'])
+            if state['annot'].get_visible():
+                fig.draw_artist(state['annot'])
+            fig.canvas.blit(fig.bbox)
+
         def on_hover(event):
+            # Redraw only when the hovered asset changes, and then only the tooltip
             if event.inaxes == scatter_ax:
                 cont, ind = state['sc'].contains(event)
                 if cont:
-                    pos = state['sc'].get_offsets()[ind["ind"][0]]
-                    state['annot'].xy = pos
-                    asset = state['df'].iloc[ind["ind"][0]]['asset_name']
-                    ret = state['df'].iloc[ind["ind"][0]]['avg_return']
+                    i = ind["ind"][0]
+                    if i == state['last_ind']:
+                        return
+                    state['last_ind'] = i
+                    state['annot'].xy = state['sc'].get_offsets()[i]
+                    asset = state['df'].iloc[i]['asset_name']
+                    ret = state['df'].iloc[i]['avg_return']
                     state['annot'].set_text(f"{asset}\nReturn: {ret:+.1%}")
                     state['annot'].set_visible(True)
-                    fig.canvas.draw_idle()
-                else:
-                    if state['annot'].get_visible():
-                        state['annot'].set_visible(False)
-                        fig.canvas.draw_idle()
+                    refresh_tooltip()
+                elif state['last_ind'] != -1:
+                    state['last_ind'] = -1
+                    state['annot'].set_visible(False)
+                    refresh_tooltip()
 
         def transition(new_sma):
             if new_sma == state['active_sma']: return
-            old_df = state['df']
-            state['df'] = get_data(new_sma)
+            state['df'] = self._valid_results_df(new_sma)
 
             # Faster transition for live presentation
-            for a in np.linspace(1.0, 0.0, 5): 
-                draw_plot(old_df, alpha=a)
-                plt.pause(0.001)
+            fade(np.linspace(1.0, 0.0, 5))
 
             update_ui_text(state['df'], new_sma)
+            draw_plot(get_plot_arrays(state['df'], new_sma), alpha=0.0)  # axes are rebuilt once per switch
+
+            fade(np.linspace(0.0, 1.0, 5))
+            fig.canvas.draw_idle()
+            plt.pause(0.001)  # one event-loop tick per switch, not one per fade frame
 
-            for a in np.linspace(0.0, 1.0, 5):
-                draw_plot(state['df'], alpha=a)
-                plt.pause(0.001)
-            
             state['active_sma'] = new_sma
 
-        # --- Button Generation ---
-        btns = {}
+        # --- SMA Selector ---
+        # Plain pickable labels in the nav row instead of one Button widget (and axes) per SMA
+        nav_labels = {}
         for i, sma in enumerate(sma_values[:3]):
-            ax_b = fig.add_axes([0.4 + i*0.09, 0.94, 0.08, 0.035])
-            b = Button(ax_b, f"SMA {sma}", color=INACTIVE_PURPLE, hovercolor=ACCENT_PURPLE)
-            b.label.set_color(TEXT_DIM); b.label.set_weight('bold')
-            b.on_clicked(lambda e, v=sma: transition(v))
-            btns[sma] = b
+            label = nav_ax.text(
+                0.44 + i*0.09, 0.9575, f"SMA {sma}", transform=fig.transFigure,
+                ha="center", va="center", color=TEXT_DIM, weight='bold', picker=True,
+                bbox=dict(boxstyle="square,pad=0.6", fc=INACTIVE_PURPLE, ec="none")
+            )
+            nav_labels[label] = sma
+
+        def highlight_nav(active_sma):
+            for label, sma in nav_labels.items():
+                label.get_bbox_patch().set_facecolor(ACCENT_PURPLE if sma == active_sma else INACTIVE_PURPLE)
+
+        def on_pick(event):
+            sma = nav_labels.get(event.artist)
+            if sma is not None:
+                highlight_nav(sma)
+                transition(sma)
 
         # Initial Render
-        state['df'] = get_data(state['active_sma'])
+        state['df'] = self._valid_results_df(state['active_sma'])
         update_ui_text(state['df'], state['active_sma'])
-        draw_plot(state['df'])
+        draw_plot(get_plot_arrays(state['df'], state['active_sma']))
+        highlight_nav(state['active_sma'])
+        fig.canvas.mpl_connect("draw_event", on_draw)
         fig.canvas.mpl_connect("motion_notify_event", on_hover)
+        fig.canvas.mpl_connect("pick_event", on_pick)
 
         plt.show()
@@ -1,73 +1,91 @@
 from strategy import Strategy
 from indicators import Indicators
-from numba import njit
+from numba import njit, types
 import numpy as np
 import pandas as pd 
 
-@njit    
-def update_prices(i, entry_price, price, partial_exit_price, update_partial, update_exit, entry_prices, partial_exit_prices, exit_prices):
-    entry_prices[i] = entry_price
-    if update_partial:
-        partial_exit_prices[i] = partial_exit_price
-    if update_exit:
-        exit_prices[i] = price
-            
-@njit
+# fastmath without 'nnan'/'ninf': the stop-loss comparisons must stay correct on NaN prices
+_FASTMATH = {"nsz", "arcp", "contract", "afn", "reassoc"}
+
+
+# Prices are float32 (as loaded), signals bool; inputs may be read-only copy-on-write views.
+# Compiling this one signature up front also skips type dispatch on every call.
+_PRICES = types.Array(types.float32, 1, "C", readonly=True)
+_SIGNALS = types.Array(types.boolean, 1, "C", readonly=True)
+_BACKTEST_SIGNATURE = types.Tuple((
+    types.int64[::1], types.int64[::1], types.float32[::1], types.float32[::1], types.float32[::1]
+))(_PRICES, _PRICES, _PRICES, _SIGNALS, _SIGNALS, _SIGNALS)
+
+
+@njit(_BACKTEST_SIGNATURE, cache=True, nogil=True, fastmath=_FASTMATH, boundscheck=False)
 def execute_backtest(open_price, close, low, entry_signal, partial_exit_signal, exit_signal):
+    """
+    Simulate the strategy bar by bar and return only the completed trades:
+    entry rows, exit rows, entry prices, partial exit prices (NaN when the
+    trade had no partial exit) and exit prices, one element per trade.
+    """
     in_position = False
     partial_is_done = False
-    entry_price = 0.0
-    stop_loss_price = 0.0
-    partial_exit_price = 0.0
-
-    # entry and exit signals
-    entry_flags = np.zeros_like(close, dtype=np.bool_)
-    partial_exit_flags = np.zeros_like(close, dtype=np.bool_)
-    exit_flags = np.zeros_like(close, dtype=np.bool_)
-
-    # price tracking
-    entry_prices = np.full_like(close, np.nan, dtype=np.float64)
-    partial_exit_prices = np.full_like(close, np.nan, dtype=np.float64)
-    exit_prices = np.full_like(close, np.nan, dtype=np.float64)
-
-    for i in range(len(close)):
-        
+    entry_row = 0
+    entry_price = np.float32(0.0)
+    stop_loss_price = np.float32(0.0)
+    partial_exit_price = np.float32(0.0)
+
+    # One slot per possible trade (a trade can open and stop out on the same bar)
+    n = len(close)
+    entry_rows = np.empty(n, dtype=np.int64)
+    exit_rows = np.empty(n, dtype=np.int64)
+    entry_prices = np.empty(n, dtype=np.float32)
+    partial_exit_prices = np.empty(n, dtype=np.float32)
+    exit_prices = np.empty(n, dtype=np.float32)
+    n_trades = 0
+
+    for i in range(n):
+        low_i = low[i]
+        close_i = close[i]
+
         if entry_signal[i] and not in_position: # Entering a postion 
             in_position = True
+            entry_row = i
             entry_price = open_price[i]
 
-            stop_loss_price = low[i - 1] if i > 0 else low[i]
-            entry_flags[i] = True
+            stop_loss_price = low[i - 1] if i > 0 else low_i
             partial_is_done = False
-            update_prices(i, open_price[i], np.nan, partial_exit_price, 0, 0, entry_prices, partial_exit_prices, exit_prices)
-
-            if low[i] < stop_loss_price: # stop loss hit on entry day 
-                exit_flags[i] = True
-                in_position = False
-                update_prices(i, entry_price, stop_loss_price, partial_exit_price,int(partial_is_done), 1, entry_prices, partial_exit_prices, exit_prices) 
 
-        elif in_position:
-            if low[i] < stop_loss_price: # stop loss or normal exit (take profit)
-                exit_flags[i] = True
-                in_position = False
-                update_prices(i, entry_price, stop_loss_price, partial_exit_price, int(partial_is_done), 1, entry_prices, partial_exit_prices, exit_prices)
-                
-            elif exit_signal[i]:
-                exit_flags[i] = True
-                in_position = False
-                update_prices(i, entry_price, close[i], partial_exit_price, int(partial_is_done), 1, entry_prices, partial_exit_prices, exit_prices)
-                
-            elif partial_exit_signal[i] and not partial_is_done:
-                partial_exit_flags[i] = True
-                partial_is_done = True
-                stop_loss_price = entry_price
-                partial_exit_price = close[i]
-                update_prices(i, entry_price, close[i], partial_exit_price, int(partial_is_done), 0, entry_prices, partial_exit_prices, exit_prices)
-                
+            if low_i < stop_loss_price: # stop loss hit on entry day 
+                exit_price = stop_loss_price
             else:
-                update_prices(i, entry_price, close[i], partial_exit_price, int(partial_is_done), 0, entry_prices, partial_exit_prices, exit_prices)
+                continue
 
-    return entry_flags, partial_exit_flags, exit_flags, entry_prices, partial_exit_prices, exit_prices
+        elif in_position:
+            # Resolve the bar with selects instead of an if/elif cascade (priority:
+            # stop loss, then exit signal, then partial exit); only "exit or not" branches.
+            stop_hit = low_i < stop_loss_price # stop loss or normal exit (take profit)
+            exit_now = stop_hit | exit_signal[i]
+            exit_price = stop_loss_price if stop_hit else close_i
+
+            take_partial = partial_exit_signal[i] & ~partial_is_done & ~exit_now
+            partial_exit_price = close_i if take_partial else partial_exit_price
+            stop_loss_price = entry_price if take_partial else stop_loss_price # remaining half is protected at break-even
+            partial_is_done |= take_partial
+
+            if not exit_now:
+                continue
+
+        else:
+            continue
+
+        # Exit bar: record the completed trade
+        in_position = False
+        entry_rows[n_trades] = entry_row
+        exit_rows[n_trades] = i
+        entry_prices[n_trades] = entry_price
+        partial_exit_prices[n_trades] = partial_exit_price if partial_is_done else np.nan
+        exit_prices[n_trades] = exit_price
+        n_trades += 1
+
+    return (entry_rows[:n_trades], exit_rows[:n_trades], entry_prices[:n_trades],
+            partial_exit_prices[:n_trades], exit_prices[:n_trades])
 
 class RsiSmaStrategy(Strategy):
     def __init__(self, dataFrame: pd.DataFrame, params: dict | None = None):
@@ -83,70 +101,81 @@ class RsiSmaStrategy(Strategy):
         self.col_sma = f"SMA_{self.sma_p}"
 
         # Calculate RSI and SMA if not already present
-        dataFrame[self.col_rsi] = Indicators.calculate_rsi(dataFrame['Close'], period=self.rsi_p)
-        dataFrame[self.col_sma] = Indicators.calculate_sma(dataFrame['Close'], period=self.sma_p)
+        if self.col_rsi not in dataFrame.columns or self.col_sma not in dataFrame.columns:
+            close = dataFrame['Close'].to_numpy(dtype=np.float64)
+            if self.col_rsi not in dataFrame.columns:
+                dataFrame[self.col_rsi] = Indicators.calculate_rsi(close, period=self.rsi_p)
+            if self.col_sma not in dataFrame.columns:
+                dataFrame[self.col_sma] = Indicators.calculate_sma(close, period=self.sma_p)
 
 
-    def generate_entry_signals(self) -> pd.Series:
+    def generate_entry_signals(self) -> np.ndarray:
         """
         Generate vectorized entry signals for RSI_SMA strategy.
-        RSI < 30 and Close > SMA.
-        :return: Boolean Series of entry signals.
+        Previous bar RSI < 30 and Close > SMA, and today's Open above yesterday's Close.
+        The one-bar lag is done by slicing the arrays, the first bar never signals.
+        :return: Boolean array of entry signals.
         """
         df = self.dataFrame
-        return (df[self.col_rsi].shift(1) < 30) & (df['Close'].shift(1) > df[self.col_sma].shift(1)) & (df['Open'] > df['Close'].shift(1)) # & (df['Close'].shift(1) <= df[self.col_sma].shift(1) * 1.03)# can be used to trade only when the price is close to the SMA
+        rsi = df[self.col_rsi].to_numpy()
+        close = df['Close'].to_numpy()
+        sma = df[self.col_sma].to_numpy()
+        open_price = df['Open'].to_numpy()
+
+        signals = np.zeros(len(close), dtype=np.bool_)
+        signals[1:] = (rsi[:-1] < 30) & (close[:-1] > sma[:-1]) & (open_price[1:] > close[:-1]) # & (close[:-1] <= sma[:-1] * 1.03)# can be used to trade only when the price is close to the SMA
+        return signals
 
-    def generate_partial_exit_signals(self) -> pd.Series:
+    def generate_partial_exit_signals(self) -> np.ndarray:
         """
         Generate vectorized partial exit signals for RSI_SMA strategy.
         RSI_10 > 40.
-        :return: Boolean Series of partial exit signals.
+        :return: Boolean array of partial exit signals.
         """
-        df = self.dataFrame
-        return df[self.col_rsi] > 40
+        return self.dataFrame[self.col_rsi].to_numpy() > 40
 
-    def generate_exit_signals(self) -> pd.Series:
+    def generate_exit_signals(self) -> np.ndarray:
         """
         Generate vectorized exit signals for RSI_SMA strategy.
         RSI_10 > 60.
-        :return: Boolean Series of exit signals.
+        :return: Boolean array of exit signals.
         """
-        df = self.dataFrame
-        return df[self.col_rsi] > 60
+        return self.dataFrame[self.col_rsi].to_numpy() > 60
     
     def run_backtest(self) -> pd.DataFrame:
-        df = self.dataFrame.copy()
-        # Generate signals
-        df['entry_signal'] = self.generate_entry_signals()
-        df['partial_exit_signal'] = self.generate_partial_exit_signals()
-        df['exit_signal'] = self.generate_exit_signals()
-        
-        df['entry_flags'], df['partial_exit_flags'], df['exit_flags'], df['entry_price'], df['partial_exit_price'], df['exit_price'] = execute_backtest(df['Open'].values, df['Close'].values, df['Low'].values, df['entry_signal'].values, df['partial_exit_signal'].values, df['exit_signal'].values)
-
-        # Clean up the dataframe by removing signal columns
-        df.drop(['entry_signal', 'exit_signal', 'partial_exit_signal'], axis=1, inplace=True)
-
-        df_exits = df[df['exit_flags']].copy()
-        df_exits['entry_date'] = df.index[df['entry_flags']].values[:len(df_exits)]
-
-        # Set exit date (current index) and clean up the df
-        df_exits['exit_date'] = df_exits.index
-        df_exits = df_exits.drop(['Open', 'Close', 'Low', 'entry_flags', 'partial_exit_flags', 'exit_flags', self.col_rsi, self.col_sma], axis=1)
-
-        # Reindex with trade ID and reorganize columns
-        df_exits = df_exits.reset_index(drop=True)
-        df_exits.index = df_exits.index + 1  # Start from 1 instead of 0
-        df_exits.index.name = 'Trade ID'
-
-        # Reorder columns to put dates first
-        cols = ['entry_date', 'exit_date'] + [col for col in df_exits.columns if col not in ['entry_date', 'exit_date']]
-        df_exits = df_exits[cols]
-
-        # Calculate returns for each trade
-        df_exits['return_pct'] = np.where(
-            df_exits['partial_exit_price'].notna(),# if partial_exit_price not nan
-            0.5 * (df_exits['partial_exit_price'] - df_exits['entry_price']) / df_exits['entry_price'] * 100 +
-            0.5 * (df_exits['exit_price'] - df_exits['entry_price']) / df_exits['entry_price'] * 100,
-            (df_exits['exit_price'] - df_exits['entry_price']) / df_exits['entry_price'] * 100) # if partial_exit_price is nan
-        
+        df = self.dataFrame
+        # float32 prices are the stored precision, so these are usually views, not copies
+        open_price, close, low = (
+            np.ascontiguousarray(df[col].to_numpy(dtype=np.float32)) for col in ('Open', 'Close', 'Low')
+        )
+        entry_rows, exit_rows, entry_price, partial_exit_price, exit_price = execute_backtest(
+            open_price, close, low,
+            self.generate_entry_signals(), self.generate_partial_exit_signals(), self.generate_exit_signals()
+        )
+        n_trades = len(exit_rows)
+
+        # Trade-sized arrays: widen once so returns are computed in float64
+        entry_price, partial_exit_price, exit_price = (
+            prices.astype(np.float64) for prices in (entry_price, partial_exit_price, exit_price)
+        )
+
+        # Calculate returns for each trade: with a partial exit, half the position closed there
+        scale = 100.0 / entry_price
+        full_return = (exit_price - entry_price) * scale
+        return_pct = np.where(
+            np.isnan(partial_exit_price),
+            full_return,
+            0.5 * (partial_exit_price - entry_price) * scale + 0.5 * full_return,
+        )
+
+        # Build the (small) trade table directly, one row per trade, dates first
+        df_exits = pd.DataFrame({
+            'entry_date': df.index[entry_rows],
+            'exit_date': df.index[exit_rows],
+            'entry_price': entry_price,
+            'partial_exit_price': partial_exit_price,
+            'exit_price': exit_price,
+            'return_pct': return_pct,
+        }, index=pd.RangeIndex(1, n_trades + 1, name='Trade ID'))  # Start from 1 instead of 0
+
         return df_exits
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 from abc import ABC, abstractmethod
 
@@ -12,11 +13,11 @@ class Strategy(ABC):
         self.params = params or {} 
 
     @abstractmethod
-    def generate_entry_signals(self) -> pd.Series:
+    def generate_entry_signals(self) -> pd.Series | np.ndarray:
         pass
 
     @abstractmethod
-    def generate_exit_signals(self) -> pd.Series:
+    def generate_exit_signals(self) -> pd.Series | np.ndarray:
         pass
     
     @abstractmethod
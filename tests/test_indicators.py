@@ -0,0 +1,26 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import talib
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from indicators import Indicators
+
+
+def test_add_sma_matches_talib_on_nan_prefixed_input():
+    values = np.r_[np.nan, np.nan, np.arange(1.0, 30.0)]
+    df = Indicators.add_sma(pd.DataFrame({"Close": values}), period=5)
+
+    np.testing.assert_allclose(df["SMA_5"].to_numpy(), talib.SMA(values, timeperiod=5), equal_nan=True)
+
+
+def test_rsi_fast_matches_talib_on_nan_prefixed_input():
+    rng = np.random.default_rng(0)
+    values = np.r_[np.full(5, np.nan), 100 + rng.standard_normal(60).cumsum()]
+
+    np.testing.assert_allclose(
+        Indicators.calculate_rsi_fast(values, period=10), talib.RSI(values, timeperiod=10), equal_nan=True
+    )